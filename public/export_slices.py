@@ -0,0 +1,21 @@
+"""Slice worker of the parallel export engine (see _export_parallel in app.py).
+
+It lives outside app.py because the slice processes are spawned, not forked: a spawned
+worker imports the module of the function it runs, and importing this one only needs
+psycopg2, not the Flask app, its database pools and background threads."""
+import psycopg2
+
+
+def copy_slice(dsn, timezone, copy_sql, out_path, app_name=None):
+    """Process-pool worker: run one COPY on a fresh connection and write it to `out_path`."""
+    conn = psycopg2.connect(dsn, application_name=app_name or 'export-slice')
+    try:
+        cur = conn.cursor()
+        cur.execute("SET TIME ZONE %s", (timezone,))
+        with open(out_path, 'wb') as out:
+            cur.copy_expert(copy_sql, out, size=1024 * 1024)
+        cur.close()
+        conn.rollback()
+    finally:
+        conn.close()
+    return out_path
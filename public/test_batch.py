@@ -0,0 +1,65 @@
+"""Tests for /query-batch. Run from public/ with `python -m pytest` (importing app needs the
+database it is configured for; the batch runs real exports into JOB_FILES)."""
+import time
+
+import app as A
+
+DAY = A.BUCKET_LEVELS['day']
+
+
+def _spec(low, high, **extra):
+    return dict({'datelow': low, 'datehigh': high, 'exchange_ids': [], 'tickers': [], 'ticker_patterns': [],
+                 'pricelow': None, 'pricehigh': None, 'sizelow': None, 'sizehigh': None}, **extra)
+
+
+def test_overlapping_ranges_form_groups():
+    specs = [_spec(10 * DAY, 12 * DAY), _spec(0, DAY), _spec(11 * DAY, 20 * DAY),
+             _spec(30 * DAY, None), _spec(DAY, 2 * DAY)]
+    assert A._batch_groups(specs) == [[1, 4], [0, 2], [3]]
+
+
+def test_shared_scan_reads_the_union_of_filters():
+    scan = A._batch_scan_spec([_spec(0, DAY, pricelow=10.0, exchange_ids=[12]),
+                               _spec(DAY // 2, 2 * DAY, pricelow=5.0, pricehigh=50.0, exchange_ids=[2])])
+    assert (scan['datelow'], scan['datehigh']) == (0, 2 * DAY)
+    assert (scan['pricelow'], scan['pricehigh']) == (5.0, None)
+    assert scan['exchange_ids'] == [2, 12]
+    # a query without an exchange filter needs every exchange
+    assert A._batch_scan_spec([_spec(0, DAY, exchange_ids=[12]), _spec(0, DAY)])['exchange_ids'] == []
+
+
+def test_batch_sig_keeps_query_order():
+    assert A._batch_sig(['a', 'b']) != A._batch_sig(['b', 'a'])
+    assert A._batch_sig(['a', 'b']) == A._batch_sig(['a', 'b'])
+
+
+def test_batch_result_matches_single_queries():
+    client = A.app.test_client()
+    headers = {'Authorization': 'Bearer ' + client.post(
+        '/login', json={'username': 'admin', 'password': 'admin123'}).json['token']}
+    queries = [
+        {'datelow': '2023-11-14', 'datehigh': '2023-11-16', 'sortby': 'timeold', 'pricehigh': 100.77},
+        {'datelow': '2023-11-15', 'datehigh': '2023-11-17', 'sortby': 'sizedesc', 'pricehigh': 100.77},
+        {'datelow': '2023-11-14', 'datehigh': '2023-11-16', 'sortby': 'timeold', 'pricehigh': 100.77},
+    ]
+    submitted = client.post('/query-batch', json={'queries': queries}, headers=headers)
+    assert submitted.status_code in (200, 202)
+    for _ in range(300):
+        result = client.get(f"/jobs/{submitted.json['job_id']}/result", headers=headers)
+        if result.status_code != 202:
+            break
+        time.sleep(0.1)
+    assert result.status_code == 200
+    files = result.json['files']
+    assert [entry['index'] for entry in files] == [0, 1, 2]
+    assert files[0]['filename'] == files[2]['filename']
+    for query, entry in zip(queries, files):
+        assert entry['status'] == 'done'
+        single = client.post('/query', json=query, headers=headers).json
+        assert single['filename'] == entry['filename']
+
+
+def test_invalid_batches():
+    client = A.app.test_client()
+    assert client.post('/query-batch', json={'queries': []}).status_code == 400
+    assert client.post('/query-batch', json={'queries': [{'aggregateby': 'bogus'}]}).status_code == 400
@@ -0,0 +1,68 @@
+"""Tests for /download: ranges, ETags and stored compression. Run from public/ with
+`python -m pytest` (importing app needs the database it is configured for)."""
+import gzip
+import os
+
+import pytest
+
+import app as A
+
+BODY = b''.join(b'AAPL,XNAS,2023-11-14,09:30:00.%09d,101.5,%d,,\n' % (i, i) for i in range(2000))
+
+
+@pytest.fixture
+def client():
+    return A.app.test_client()
+
+
+@pytest.fixture
+def stored(request):
+    """Name of an export file in JOB_FILES, plain or gzip-compressed (param), removed after."""
+    filename = f"trades_{'ab' * 16}.csv" + ('.gz' if request.param == 'gzip' else '')
+    path = os.path.join(A.JOB_FILES, filename)
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(BODY, mtime=0) if request.param == 'gzip' else BODY)
+    yield filename
+    os.remove(path)
+
+
+@pytest.mark.parametrize('stored', ['plain'], indirect=True)
+def test_full_and_ranged_download(client, stored):
+    full = client.get(f'/download/{stored}')
+    assert full.status_code == 200 and full.data == BODY
+    assert full.headers['Accept-Ranges'] == 'bytes'
+    etag = full.headers['ETag']
+
+    part = client.get(f'/download/{stored}', headers={'Range': 'bytes=1000-'})
+    assert part.status_code == 206
+    assert part.data == BODY[1000:]
+    assert part.headers['Content-Range'] == f'bytes 1000-{len(BODY) - 1}/{len(BODY)}'
+
+    # resuming against the same file continues; against a regenerated one starts over
+    resumed = client.get(f'/download/{stored}', headers={'Range': 'bytes=1000-', 'If-Range': etag})
+    assert resumed.status_code == 206 and resumed.data == BODY[1000:]
+    stale = client.get(f'/download/{stored}', headers={'Range': 'bytes=1000-', 'If-Range': '"other"'})
+    assert stale.status_code == 200 and stale.data == BODY
+
+    assert client.get(f'/download/{stored}', headers={'If-None-Match': etag}).status_code == 304
+    assert client.get(f'/download/{stored}', headers={'Range': f'bytes={len(BODY) + 10}-'}).status_code == 416
+
+
+@pytest.mark.parametrize('stored', ['gzip'], indirect=True)
+def test_compressed_file_is_served_as_stored_or_decompressed(client, stored):
+    raw = client.get(f'/download/{stored}', headers={'Accept-Encoding': 'gzip'})
+    assert raw.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(raw.data) == BODY
+    part = client.get(f'/download/{stored}', headers={'Accept-Encoding': 'gzip', 'Range': 'bytes=10-'})
+    assert part.status_code == 206 and part.data == raw.data[10:]
+
+    plain = client.get(f'/download/{stored}', headers={'Accept-Encoding': 'identity'})
+    assert plain.status_code == 200 and 'Content-Encoding' not in plain.headers
+    assert plain.headers['Accept-Ranges'] == 'none'
+    assert plain.data == BODY
+    # the two representations must not share an ETag
+    assert plain.headers['ETag'] != raw.headers['ETag']
+
+
+def test_missing_file(client):
+    assert client.get('/download/trades_missing.csv').status_code == 404
@@ -0,0 +1,46 @@
+"""Tests for the derived-column expression engine. Run from public/ with `python -m pytest`
+(importing app needs the database it is configured for)."""
+import pytest
+
+import app as A
+
+
+@pytest.mark.parametrize('literal, value', [
+    ('0.00001', 0.00001),
+    ('0.000000123', 0.000000123),
+    ('10000000000000000', 1e16),
+    ('123456789012345678901234567890', 1.2345678901234568e29),
+    ('1e-05', 1e-05),
+    ('2.5E+3', 2500.0),
+    ('.5', 0.5),
+    ('7', 7.0),
+])
+def test_number_literals_round_trip(literal, value):
+    normalized = A.normalize_expression(f'PRICE*{literal}')
+    # the normalized text is tokenized again when it is compiled
+    assert A.normalize_expression(normalized) == normalized
+    compiled = A.compile_expression(f'PRICE*{literal}')
+    assert compiled.ast == ('*', ('col', 'PRICE'), ('num', value))
+    # evaluated values are rounded to 6 places like the CSV writer
+    assert A.evaluate_expression(f'PRICE*{literal}', 2.0, 1) == round(2.0 * value, 6)
+
+
+def test_small_literal_compiles_to_sql_and_program():
+    program = A.compile_operations(['PRICE*0.00001', 'SIZE*10000000000000000'])
+    assert program.sql == ['(price * 1e-05)', '(trade_size * 1e+16)']
+    with A.app.app_context():
+        row = A.db.session.execute(A.db.text(
+            f"SELECT {program.sql[0]}, {program.sql[1]} FROM (SELECT 2.0 AS price, 3 AS trade_size) AS t")).one()
+    assert float(row[0]) == pytest.approx(2e-05)
+    assert float(row[1]) == pytest.approx(3e16)
+
+
+def test_normalization_is_canonical():
+    assert A.normalize_expression(' price *  SIZE ') == 'PRICE * SIZE'
+    assert A.normalize_expression('PRICE*1.50') == A.normalize_expression('PRICE * 1.5')
+
+
+@pytest.mark.parametrize('expression', ['PRICE*2e', 'PRICE*1e999', 'PRICE*x', 'PRICE*(SIZE', ''])
+def test_invalid_expressions(expression):
+    with pytest.raises(A.ExpressionError):
+        A.compile_expression(expression)
@@ -0,0 +1,72 @@
+"""Tests for trade ingest. Run from public/ with `python -m pytest` (importing app needs the
+database it is configured for; the load test adds rows far in the future and removes them)."""
+import pytest
+
+import app as A
+
+HEADER = 'ticker,exchange,participant_timestamp,price,trade_size\n'
+# 2099-01-01, after any real trade
+FUTURE_NS = 4070908800 * 10**9
+
+
+def _python_rows(csv_text):
+    return [tuple(None if value == '' else value for value in line.split(',')) + (None, None)
+            for line in csv_text.strip().splitlines()]
+
+
+def _validate_both(tmp_path, csv_text):
+    """IngestError message (or None) from the pyarrow and the pure-Python validators."""
+    messages = []
+    path = tmp_path / 'trades.csv'
+    path.write_text(HEADER + csv_text)
+    batches = [lambda: A._validate_python_batch(_python_rows(csv_text))]
+    if A.pa is not None:
+        batches.append(lambda: [A._validate_arrow_batch(t) for t in A._arrow_batches(str(path), 'csv', 100)])
+    for validate in batches:
+        try:
+            validate()
+            messages.append(None)
+        except A.IngestError as e:
+            messages.append(str(e))
+    return messages
+
+
+@pytest.mark.parametrize('csv_text', [
+    'AAPL,-1,1700000000000000000,100.5,10\n',
+    ',12,1700000000000000000,100.5,10\n',
+    'AAPL,12,1700000000000000000,0,10\n',
+    'AAPL,12,1700000000000000000,100.5,-3\n',
+    'AAPL,12,-5,100.5,10\n',
+])
+def test_validators_reject_the_same_rows(tmp_path, csv_text):
+    assert all(_validate_both(tmp_path, csv_text))
+
+
+def test_validators_accept_valid_rows(tmp_path):
+    assert _validate_both(tmp_path, 'AAPL,0,1700000000000000000,100.5,10\nAAICpB,12,1700000000000000001,25,1\n') \
+        == [None] * (2 if A.pa is not None else 1)
+
+
+@pytest.fixture
+def future_trades():
+    yield
+    with A.app.app_context():
+        A.db.session.execute(A.db.text("DELETE FROM trades WHERE participant_timestamp >= :low"), {'low': FUTURE_NS})
+        A.db.session.execute(A.db.text("DELETE FROM ingest_log WHERE min_ts >= :low"), {'low': FUTURE_NS})
+        for name, low, _ in A._trade_partitions() if A._trades_is_partitioned() else []:
+            if low >= FUTURE_NS:
+                A.db.session.execute(A.db.text(f"DROP TABLE {name}"))
+        A.db.session.commit()
+
+
+def test_ingest_is_idempotent(tmp_path, future_trades):
+    path = tmp_path / 'future.csv'
+    path.write_text(HEADER + ''.join(f'ZZTEST,12,{FUTURE_NS + i},10.5,{i + 1}\n' for i in range(25)))
+    with A.app.app_context():
+        first = A.ingest_trades_file(str(path), batch_rows=10)
+        again = A.ingest_trades_file(str(path), batch_rows=10)
+        count = A.db.session.execute(A.db.text(
+            "SELECT COUNT(*) FROM trades WHERE participant_timestamp >= :low"), {'low': FUTURE_NS}).scalar()
+    assert (first['batches_loaded'], first['rows_loaded']) == (3, 25)
+    assert (again['batches_loaded'], again['batches_skipped'], again['rows_loaded']) == (0, 3, 0)
+    assert count == 25
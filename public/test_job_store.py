@@ -0,0 +1,78 @@
+"""Tests for job leases and recovery in the SQLite job store. Run from public/ with
+`python -m pytest` (importing app needs the database it is configured for). Jobs use
+made-up signatures and are deleted afterwards; nothing is exported."""
+import uuid
+
+import pytest
+
+import app as A
+
+
+@pytest.fixture
+def sig():
+    sig = 'test' + uuid.uuid4().hex
+    yield sig
+    with A._job_tx() as conn:
+        conn.execute("DELETE FROM jobs WHERE sig = ?", (sig,))
+        conn.execute("DELETE FROM job_users WHERE sig = ?", (sig,))
+
+
+@pytest.fixture
+def queued(monkeypatch):
+    """Calls _recover_jobs makes to _queue_export, instead of running the jobs."""
+    calls = []
+    monkeypatch.setattr(A, '_queue_export', lambda sig, data, kind='export': calls.append((sig, data, kind)))
+    return calls
+
+
+def _lapse(sig, attempts=None):
+    with A._job_tx() as conn:
+        conn.execute("UPDATE jobs SET lease_owner = 'gone:1', lease_expires = 0 WHERE sig = ?", (sig,))
+        if attempts is not None:
+            conn.execute("UPDATE jobs SET attempts = ? WHERE sig = ?", (attempts, sig))
+
+
+def test_live_lease_is_not_claimed_twice(sig):
+    assert A._claim_job(sig, {'datelow': '2023-11-14'}, 'user:1')
+    assert not A._claim_job(sig, {'datelow': '2023-11-14'}, 'user:2')
+    meta = A._read_meta(sig)
+    assert meta['status'] == 'queued' and meta['lease_owner'] == A._job_owner()
+    assert sorted(meta['users']) == ['user:1', 'user:2']
+
+
+def test_lapsed_lease_can_be_claimed(sig):
+    assert A._claim_job(sig, {}, 'anon')
+    _lapse(sig)
+    assert A._claim_job(sig, {}, 'anon')
+    assert A._read_meta(sig)['attempts'] == 1
+
+
+@pytest.mark.parametrize('kind', ['export', 'batch'])
+def test_recovery_requeues_with_the_stored_kind(sig, queued, kind):
+    data = {'queries': [{}]} if kind == 'batch' else {'datelow': '2023-11-14'}
+    A._claim_job(sig, data, 'anon', kind)
+    _lapse(sig)
+    A._recover_jobs()
+    assert (sig, data, kind) in queued
+    meta = A._read_meta(sig)
+    assert (meta['status'], meta['attempts'], meta['lease_owner']) == ('queued', 2, A._job_owner())
+    assert meta['lease_expires'] > A.time.time()
+
+
+def test_recovery_gives_up_after_max_attempts(sig, queued):
+    A._claim_job(sig, {}, 'anon')
+    _lapse(sig, attempts=A.JOB_MAX_ATTEMPTS)
+    A._recover_jobs()
+    assert not [call for call in queued if call[0] == sig]
+    meta = A._read_meta(sig)
+    assert meta['status'] == 'error' and 'lost' in meta['error']
+
+
+def test_recovery_honours_a_cancel(sig, queued):
+    A._claim_job(sig, {}, 'anon')
+    with A._job_tx() as conn:
+        conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE sig = ?", (sig,))
+    _lapse(sig)
+    A._recover_jobs()
+    assert not [call for call in queued if call[0] == sig]
+    assert A._read_meta(sig)['status'] == 'cancelled'
@@ -0,0 +1,116 @@
+"""Tests for query parsing, the cache signature and output headers. Run from public/ with
+`python -m pytest` (importing app needs the database it is configured for)."""
+import struct
+
+import pytest
+
+import app as A
+
+
+def _spec(**body):
+    spec, error = A._parse_query_spec(dict({'datelow': '2023-11-14', 'datehigh': '2023-11-20'}, **body))
+    assert error is None
+    return spec
+
+
+def test_sig_ignores_spelling_and_order():
+    a = _spec(exchanges=['Nasdaq', 'NYSE'], pricelow=1, operations=[{'expression': 'PRICE*SIZE'}])
+    b = _spec(exchanges=['NYSE', 'Nasdaq'], pricelow='1.0', operations=[{'expression': 'price * size'}])
+    assert A._canonical_query(a) == A._canonical_query(b)
+    assert A._sig_for_request(a) == A._sig_for_request(b)
+
+
+@pytest.mark.parametrize('aggregateby', [None, 'hr'])
+def test_spellings_that_share_a_sig_share_the_header(aggregateby):
+    a = _spec(operations=[{'expression': 'PRICE*SIZE'}, {'expression': 'price^2'}], aggregateby=aggregateby)
+    b = _spec(operations=[{'expression': 'price * size'}, {'expression': 'PRICE ^ 2.0'}], aggregateby=aggregateby)
+    assert A._sig_for_request(a) == A._sig_for_request(b)
+    assert A._export_header(a) == A._export_header(b)
+    assert 'PRICE_MULT_SIZE' in ''.join(A._export_header(a))
+    assert 'PRICE_POW_2' in ''.join(A._export_header(a))
+
+
+def test_sig_changes_with_output():
+    base = _spec(sortby='timeold')
+    assert A._sig_for_request(base) != A._sig_for_request(_spec(sortby='timenew'))
+    assert A._sig_for_request(base) != A._sig_for_request(_spec(sortby='timeold', pricehigh=200))
+    assert A._sig_for_request(base) != A._sig_for_request(_spec(sortby='timeold', format='parquet'))
+    # aggregation widths are compared by value
+    assert A._sig_for_request(_spec(aggregateby='min')) == A._sig_for_request(_spec(aggregateby='60s'))
+
+
+@pytest.mark.parametrize('bound', ['abc', [1], True, 'nan'])
+def test_invalid_bounds_are_rejected(bound):
+    spec, error = A._parse_query_spec({'datelow': '2023-11-14', 'datehigh': '2023-11-20', 'pricelow': bound})
+    assert spec is None and error
+
+
+def test_bar_columns_and_header():
+    spec = _spec(aggregateby='hr', bars=True, percentiles=[50, 99.5], groupby=['ticker'],
+                 operations=[{'expression': 'SIZE'}])
+    assert [name for name, _ in A._bar_columns(spec)] == [
+        'open', 'high', 'low', 'close', 'volume', 'trades', 'vwap', 'p50', 'p99_5']
+    assert A._export_header(spec) == ['date', 'time', 'ticker', 'open', 'high', 'low', 'close', 'volume',
+                                      'trades', 'vwap', 'p50', 'p99_5', 'SIZE_sum', 'SIZE_avg']
+    assert len(A._bar_sql(spec)) == len(A._duckdb_bar_sql(spec)) == len(A._bar_columns(spec))
+    assert A._bar_columns(_spec(aggregateby='hr')) == []
+
+
+def test_vwap_is_summed_in_double_precision():
+    spec = _spec(aggregateby='day', bars=True)
+    vwap = A._bar_sql(spec)[6]
+    with A.app.app_context():
+        value = A.db.session.execute(A.db.text(
+            f"SELECT {vwap} FROM (VALUES (101.33::real, 1000000), (99.07::real, 3)) AS t (price, trade_size)")).scalar()
+    # the float8 values of the two float4 prices
+    high, low = (struct.unpack('f', struct.pack('f', price))[0] for price in (101.33, 99.07))
+    assert value == pytest.approx((high * 1000000 + low * 3) / 1000003, rel=1e-12)
+
+
+def test_parse_tickers():
+    symbols, patterns, error = A._parse_tickers(['MSFT', 'aapl', 'AAPL', 'AAICpB', 'brk*', 'A?C'])
+    assert error is None
+    assert symbols == ['AAICpB', 'AAPL', 'MSFT']
+    assert patterns == ['A_C', 'BRK%']
+
+
+@pytest.mark.parametrize('tickers', ['AAPL', ['AAPL;'], ['TOOLONGSYMBOL'], [''], [1]])
+def test_parse_tickers_rejects(tickers):
+    assert A._parse_tickers(tickers)[2]
+
+
+def test_lower_case_tickers_match():
+    assert A._sig_for_request(_spec(tickers=['aapl', 'brk*'])) == A._sig_for_request(_spec(tickers=['AAPL', 'BRK*']))
+
+
+def test_rollup_is_grouping_sets():
+    rollup = _spec(aggregateby='day', groupby=['ticker', 'exchange'], rollup=True, bars=True)
+    sets = _spec(aggregateby='day', groupby=['ticker', 'exchange'], bars=True,
+                 groupingsets=[['exchange', 'ticker'], ['ticker'], [], ['ticker']])
+    assert rollup['groupingsets'] == sets['groupingsets'] == [['ticker', 'exchange'], ['ticker'], []]
+    assert A._sig_for_request(rollup) == A._sig_for_request(sets)
+    assert A._export_header(rollup)[:5] == ['date', 'time', 'ticker', 'exchange', 'grouping']
+
+
+@pytest.mark.parametrize('body', [
+    {'aggregateby': 'day', 'groupby': ['sector'], 'bars': True},
+    {'groupby': ['ticker'], 'bars': True},
+    {'aggregateby': 'day', 'groupby': ['ticker']},
+    {'aggregateby': 'day', 'groupby': ['ticker'], 'bars': True, 'groupingsets': [['exchange']]},
+    {'aggregateby': 'day', 'groupby': ['ticker'], 'bars': True, 'rollup': True, 'groupingsets': [[]]},
+])
+def test_invalid_grouping(body):
+    assert A._parse_query_spec(dict({'datelow': '2023-11-14', 'datehigh': '2023-11-20'}, **body))[1]
+
+
+def test_grouping_set_totals_add_up():
+    body = {'datelow': '2023-11-14', 'datehigh': '2023-11-20', 'aggregateby': 'day', 'groupby': ['exchange'],
+            'rollup': True, 'bars': True, 'limit': A.PREVIEW_MAX_ROWS}
+    page = A.app.test_client().post('/preview', json=body).json
+    columns = page['columns']
+    level, volume = columns.index('grouping'), columns.index('volume')
+    details, totals = {}, {}
+    for row in page['rows']:
+        target = details if row[level] == 0 else totals
+        target[row[0]] = target.get(row[0], 0) + int(row[volume])
+    assert details and details == totals
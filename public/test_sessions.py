@@ -0,0 +1,48 @@
+"""Tests for the login session stores. Run from public/ with `python -m pytest` (importing
+app needs the database it is configured for)."""
+import pytest
+
+import app as A
+
+TEST_USER_ID = -4242  # no real user has a negative id
+
+
+@pytest.fixture(params=['sqlite', 'postgres'])
+def store(request, tmp_path):
+    if request.param == 'sqlite':
+        yield A.SqliteSessionStore(str(tmp_path / 'sessions.db'))
+        return
+    with A.app.app_context():
+        store = A.PostgresSessionStore()
+        yield store
+        store.revoke_user(TEST_USER_ID)
+
+
+def test_create_get_and_revoke(store):
+    token = store.create(TEST_USER_ID, True)
+    assert store.get(token) == A.SessionUser(TEST_USER_ID, True)
+    assert store.get('not-a-token') is None
+    store.revoke_user(TEST_USER_ID)
+    assert store.get(token) is None
+
+
+def test_sessions_expire(store, monkeypatch):
+    monkeypatch.setattr(A, 'SESSION_TTL', -1)
+    assert store.get(store.create(TEST_USER_ID, False)) is None
+
+
+def test_sqlite_store_is_shared_between_workers(tmp_path):
+    # each worker process opens the store on the same file
+    path = str(tmp_path / 'sessions.db')
+    token = A.SqliteSessionStore(path).create(TEST_USER_ID, False)
+    assert A.SqliteSessionStore(path).get(token) == A.SessionUser(TEST_USER_ID, False)
+
+
+def test_token_from_login_authorizes_requests():
+    client = A.app.test_client()
+    login = client.post('/login', json={'username': 'admin', 'password': 'admin123'}).json
+    assert login['expires_in'] == A.SESSION_TTL
+    headers = {'Authorization': 'Bearer ' + login['token']}
+    assert client.get('/get-users', headers=headers).status_code == 200
+    assert client.get('/get-users', headers={'Authorization': 'Bearer nope'}).status_code == 403
+    assert client.get('/get-users').status_code == 401
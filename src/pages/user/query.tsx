@@ -39,7 +39,10 @@ const AGGREGATE_OPTIONS = {
   'ns': 'Nanoseconds',
   'ms': 'Milliseconds',
   's': 'Seconds',
+  '15s': '15 Seconds',
   'min': 'Minutes',
+  '5min': '5 Minutes',
+  '15min': '15 Minutes',
   'hr': 'Hours',
   'day': 'Days'
 };
@@ -77,6 +80,14 @@ export default function QueryPage() {
   const [showExchangeDropdown, setShowExchangeDropdown] = useState(false);
   const [exchangeCursorIndex, setExchangeCursorIndex] = useState(-1);
   const [exchangeDropdownIndex, setExchangeDropdownIndex] = useState(-1);
+
+  // Ticker filtering state (symbols from /tickers; * and ? typed entries are wildcards)
+  const [tickerOptions, setTickerOptions] = useState<string[]>([]);
+  const [selectedTickers, setSelectedTickers] = useState<string[]>([]);
+  const [tickerInput, setTickerInput] = useState('');
+  const [showTickerDropdown, setShowTickerDropdown] = useState(false);
+  const [tickerCursorIndex, setTickerCursorIndex] = useState(-1);
+  const [tickerDropdownIndex, setTickerDropdownIndex] = useState(-1);
   
   // Filter range state
   const [priceRange, setPriceRange] = useState([null, null]);
@@ -97,14 +108,21 @@ export default function QueryPage() {
   const [aggregateBy, setAggregateBy] = useState('ms');
   //----modified----
   const [isDownloading, setIsDownloading] = useState(false);
+  // Preview state (first pages of the export, fetched from /preview)
+  const [previewColumns, setPreviewColumns] = useState<string[]>([]);
+  const [previewRows, setPreviewRows] = useState<(string | number | null)[][]>([]);
+  const [previewCursor, setPreviewCursor] = useState<string | null>(null);
+  const [isPreviewing, setIsPreviewing] = useState(false);
   const [showExportPopup, setShowExportPopup] = useState(false);
   const [userIsAdmin, setUserIsAdmin] = useState(false);
   
   // Component refs for focus management
   const exchangeInputRef = useRef<HTMLInputElement>(null);
+  const tickerInputRef = useRef<HTMLInputElement>(null);
   const equationInputRef = useRef<HTMLInputElement>(null);
   // Container refs for pill shifting
   const exchangePillsContainerRef = useRef<HTMLDivElement>(null);
+  const tickerPillsContainerRef = useRef<HTMLDivElement>(null);
   const equationPillsContainerRef = useRef<HTMLDivElement>(null);
 
   // Dynamic shifting helper - ensures input is always visible and container scrolls adaptively
@@ -157,6 +175,19 @@ export default function QueryPage() {
     setUserIsAdmin(isAdmin());
   }, []);
 
+  // Load the distinct symbol list once the API base URL is known
+  useEffect(() => {
+    if (!cfUrl) return;
+    let mounted = true;
+    fetch(`${cfUrl}/tickers`)
+      .then(res => res.json())
+      .then(data => {
+        if (mounted && data && Array.isArray(data.tickers)) setTickerOptions(data.tickers);
+      })
+      .catch(() => {});
+    return () => { mounted = false; };
+  }, [cfUrl]);
+
   const handleLogout = () => {
     localStorage.removeItem('token');
     router.push('/user/login');
@@ -171,6 +202,15 @@ export default function QueryPage() {
     ).slice(0, 10);
   };
 
+  // Returns symbols starting with the search input
+  const getFilteredTickers = () => {
+    const prefix = tickerInput.trim().toUpperCase();
+    return tickerOptions.filter(ticker =>
+      ticker.toUpperCase().startsWith(prefix) &&
+      !selectedTickers.includes(ticker)
+    ).slice(0, 10);
+  };
+
   // Validates if a character can be typed at current cursor position in equation input
   const isValidEquationChar = (char: string, currentInput: string, cursorPos: number) => {
     const beforeCursor = currentInput.slice(0, cursorPos);
@@ -630,6 +670,78 @@ export default function QueryPage() {
     }, 0);
   };
 
+  // Ticker selection and management functions
+  const handleTickerSelect = (ticker: string) => {
+    if (!selectedTickers.includes(ticker)) {
+      setSelectedTickers(prev => [...prev, ticker]);
+    }
+    setTickerInput('');
+    setTickerCursorIndex(-1);
+    setTickerDropdownIndex(-1);
+    setTimeout(() => {
+      if (tickerInputRef.current) {
+        tickerInputRef.current.focus();
+        setShowTickerDropdown(true);
+        ensureInputVisibility(tickerInputRef, tickerPillsContainerRef, true);
+      }
+    }, 0);
+  };
+
+  const handleTickerRemove = (ticker: string) => {
+    setSelectedTickers(prev => prev.filter(t => t !== ticker));
+    setTickerCursorIndex(-1);
+    setTimeout(() => {
+      if (tickerInputRef.current) {
+        tickerInputRef.current.focus();
+        setShowTickerDropdown(true);
+      }
+    }, 0);
+  };
+
+  // Keyboard navigation for ticker dropdown; Enter also accepts a typed symbol or pattern like BRK*
+  const handleTickerKeyDown = (e: React.KeyboardEvent) => {
+    const filteredTickers = getFilteredTickers();
+    if (e.key === 'ArrowDown') {
+      e.preventDefault();
+      if (filteredTickers.length > 0) {
+        setShowTickerDropdown(true);
+        setTickerDropdownIndex(tickerDropdownIndex < filteredTickers.length - 1 ? tickerDropdownIndex + 1 : 0);
+      }
+    } else if (e.key === 'ArrowUp') {
+      e.preventDefault();
+      if (filteredTickers.length > 0) {
+        setShowTickerDropdown(true);
+        setTickerDropdownIndex(tickerDropdownIndex > 0 ? tickerDropdownIndex - 1 : filteredTickers.length - 1);
+      }
+    } else if (e.key === 'Enter') {
+      e.preventDefault();
+      if (tickerDropdownIndex >= 0 && tickerDropdownIndex < filteredTickers.length) {
+        handleTickerSelect(filteredTickers[tickerDropdownIndex]);
+      } else if (/^[A-Za-z0-9.\-*?]{1,10}$/.test(tickerInput.trim())) {
+        const typed = tickerInput.trim();
+        const known = tickerOptions.find(ticker => ticker.toUpperCase() === typed.toUpperCase());
+        // same rule as the server: mixed case is a share class (AAICpB), all lower case is upper-cased
+        handleTickerSelect(known || (/[A-Z]/.test(typed) ? typed : typed.toUpperCase()));
+      }
+    } else if (e.key === 'Escape') {
+      setShowTickerDropdown(false);
+      setTickerDropdownIndex(-1);
+    } else if (e.key === 'Backspace' && tickerInput === '') {
+      if (tickerCursorIndex >= 0 && tickerCursorIndex < selectedTickers.length) {
+        setSelectedTickers(prev => prev.filter((_, index) => index !== tickerCursorIndex));
+        setTickerCursorIndex(-1);
+      } else if (selectedTickers.length > 0) {
+        setSelectedTickers(prev => prev.slice(0, -1));
+      }
+    } else if (e.key === 'ArrowLeft' && tickerInput === '') {
+      setTickerCursorIndex(prev => Math.max(0, prev === -1 ? selectedTickers.length - 1 : prev - 1));
+    } else if (e.key === 'ArrowRight' && tickerInput === '') {
+      setTickerCursorIndex(prev => prev >= selectedTickers.length - 1 ? -1 : prev + 1);
+    } else {
+      setTickerDropdownIndex(-1);
+    }
+  };
+
   // Keyboard navigation for exchange dropdown
   const handleExchangeKeyDown = (e: React.KeyboardEvent) => {
     const filteredExchanges = getFilteredExchanges();
@@ -814,6 +926,8 @@ export default function QueryPage() {
   const handleResetFilters = () => {
     setSelectedExchanges([]);
     setExchangeInput('');
+    setSelectedTickers([]);
+    setTickerInput('');
     setSelectedEquations([]);
     setEquationInput('');
     setEquationError('');
@@ -827,6 +941,11 @@ export default function QueryPage() {
     setEquationCursorIndex(-1);
     setExchangeCursorIndex(-1);
     setExchangeDropdownIndex(-1);
+    setTickerCursorIndex(-1);
+    setTickerDropdownIndex(-1);
+    setPreviewColumns([]);
+    setPreviewRows([]);
+    setPreviewCursor(null);
   };
 
   // CSV export functions
@@ -847,26 +966,57 @@ export default function QueryPage() {
     await performDownload();
   };
 
+  // Request body for /query and /preview from the current filter settings
+  const buildRequestBody = () => ({
+    exchanges: selectedExchanges.length > 0 ? selectedExchanges : undefined,
+    tickers: selectedTickers.length > 0 ? selectedTickers : undefined,
+    pricelow: priceRange[0] ?? 0,
+    pricehigh: priceRange[1] ?? 1000,
+    sizelow: volumeRange[0] ?? 0,
+    sizehigh: volumeRange[1] ?? 1000000,
+    datelow: dateRange[0] ? dateRange[0].toISOString().split('T')[0] : '2015-07-01',
+    datehigh: dateRange[1] ? dateRange[1].toISOString().split('T')[0] : new Date().toISOString().split('T')[0],
+    operations: selectedEquations.map(eq => ({
+      expression: eq
+    })),
+    //----modified----
+    sortby: selectedEquations.length === 0 ? sortBy : undefined,
+    aggregateby: selectedEquations.length > 0 ? aggregateBy : undefined
+    //----modified----
+  });
+
+  // Fetch the first page of the export (or the next one when loadMore is set)
+  const handlePreview = async (loadMore = false) => {
+    setIsPreviewing(true);
+    try {
+      const base = cfUrl || 'http://localhost:8000';
+      const response = await fetch(`${base}/preview`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          Authorization: `Bearer ${localStorage.getItem('token')}`
+        },
+        body: JSON.stringify({ ...buildRequestBody(), limit: 100, cursor: loadMore ? previewCursor : undefined })
+      });
+      const result = await response.json();
+      if (!response.ok) {
+        throw new Error(result.error || 'Error loading preview');
+      }
+      setPreviewColumns(result.columns);
+      setPreviewRows(loadMore ? [...previewRows, ...result.rows] : result.rows);
+      setPreviewCursor(result.next_cursor);
+    } catch (error) {
+      alert(`Error: ${error instanceof Error ? error.message : 'Unknown error'}`);
+    } finally {
+      setIsPreviewing(false);
+    }
+  };
+
   // Main function to handle CSV generation and download
   const performDownload = async () => {
     try {
       // Prepare request with current filter settings
-      const requestBody = {
-        exchanges: selectedExchanges.length > 0 ? selectedExchanges : undefined,
-        pricelow: priceRange[0] ?? 0,
-        pricehigh: priceRange[1] ?? 1000,
-        sizelow: volumeRange[0] ?? 0,
-        sizehigh: volumeRange[1] ?? 1000000,
-        datelow: dateRange[0] ? dateRange[0].toISOString().split('T')[0] : '2015-07-01',
-        datehigh: dateRange[1] ? dateRange[1].toISOString().split('T')[0] : new Date().toISOString().split('T')[0],
-        operations: selectedEquations.map(eq => ({
-          expression: eq
-        })),
-        //----modified----
-        sortby: selectedEquations.length === 0 ? sortBy : undefined,
-        aggregateby: selectedEquations.length > 0 ? aggregateBy : undefined
-        //----modified----
-      };
+      const requestBody = buildRequestBody();
       
       // Request CSV generation
       const base = cfUrl || 'http://localhost:8000';
@@ -906,7 +1056,7 @@ export default function QueryPage() {
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
-      a.download = 'trades.csv';
+      a.download = `trades.${result.filename.split('.').pop()}`;
       document.body.appendChild(a);
       a.click();
       window.URL.revokeObjectURL(url);
@@ -944,7 +1094,7 @@ export default function QueryPage() {
       const url = window.URL.createObjectURL(blob);
       const a = document.createElement('a');
       a.href = url;
-      a.download = 'trades.csv';
+      a.download = `trades.${data.filename.split('.').pop()}`;
       document.body.appendChild(a);
       a.click();
       window.URL.revokeObjectURL(url);
@@ -1061,7 +1211,74 @@ export default function QueryPage() {
               )}
             </div>
 
-
+            {/* Ticker Multi-input */}
+            <div className="relative">
+              <label className="block text-xs font-semibold mb-3 text-gray-600">
+                Tickers{selectedTickers.length > 0 && ` (${selectedTickers.length} selected)`}
+              </label>
+              <div className="border border-gray-300 rounded p-2 px-3 h-[40px] flex gap-1 items-center focus-within:ring-2 focus-within:ring-blue-200 overflow-hidden">
+                <div
+                  className="flex gap-1 items-center overflow-x-auto overflow-y-hidden scrollbar-hide flex-1"
+                  ref={tickerPillsContainerRef}
+                >
+                  {selectedTickers.map((ticker, index) => (
+                    <span 
+                      key={ticker} 
+                      className={`bg-blue-100 text-blue-800 px-2 py-1 rounded text-xs flex items-center h-[30px] gap-1 flex-shrink-0 ${
+                        tickerCursorIndex === index ? 'ring-2 ring-blue-400' : ''
+                      }`}
+                    >
+                      {ticker}
+                      <button 
+                        onClick={() => handleTickerRemove(ticker)}
+                        className="text-blue-600 hover:text-blue-800 font-bold cursor-pointer !p-0"
+                      >
+                        ×
+                      </button>
+                    </span>
+                  ))}
+                  <input
+                    ref={tickerInputRef}
+                    type="text"
+                    className="flex-1 outline-none text-sm font-mono"
+                    style={{ minWidth: '60px' }}
+                    placeholder={selectedTickers.length === 0 ? "All Tickers (e.g. AAPL, BRK*)" : ""}
+                    value={tickerInput}
+                    onChange={e => {
+                      setTickerInput(e.target.value);
+                      setShowTickerDropdown(true);
+                      setTickerCursorIndex(-1);
+                      setTickerDropdownIndex(-1);
+                      setTimeout(() => ensureInputVisibility(tickerInputRef, tickerPillsContainerRef), 0);
+                    }}
+                    onFocus={() => {
+                      setShowTickerDropdown(true);
+                      setTickerCursorIndex(-1);
+                      setTickerDropdownIndex(-1);
+                      setTimeout(() => ensureInputVisibility(tickerInputRef, tickerPillsContainerRef), 0);
+                    }}
+                    onBlur={() => setTimeout(() => setShowTickerDropdown(false), 300)}
+                    onKeyDown={handleTickerKeyDown}
+                  />
+                </div>
+              </div>
+              {showTickerDropdown && tickerInput.trim() !== '' && getFilteredTickers().length > 0 && (
+                <div className="absolute z-10 w-full mt-1 bg-white border border-gray-300 rounded-lg shadow-lg max-h-32 overflow-y-auto scrollbar-hide ticker-dropdown">
+                  {getFilteredTickers().map((ticker, index) => (
+                    <div
+                      key={ticker}
+                      className={`p-2 cursor-pointer text-sm font-mono ${
+                        index === tickerDropdownIndex ? 'bg-blue-100' : 'hover:bg-blue-50'
+                      }`}
+                      onMouseDown={() => handleTickerSelect(ticker)}
+                      onMouseEnter={() => setTickerDropdownIndex(index)}
+                    >
+                      {ticker}
+                    </div>
+                  ))}
+                </div>
+              )}
+            </div>
 
             {/* Equation Builder */}
             <div className="relative">
@@ -1467,7 +1684,53 @@ export default function QueryPage() {
           >
             Resume Download
           </button>
+          <button
+            className="border border-gray-600 text-gray-600 bg-white px-6 py-2 rounded-md font-medium hover:bg-gray-600 hover:text-white focus:ring-2 focus:ring-gray-200 transition disabled:opacity-50 disabled:cursor-not-allowed cursor-pointer"
+            onClick={() => handlePreview()}
+            disabled={isPreviewing}
+            title="Show the first rows of the export without generating the file"
+          >
+            {isPreviewing ? 'Loading...' : 'Preview'}
+          </button>
         </div>
+
+        {/* Preview table */}
+        {previewColumns.length > 0 && (
+          <div className="mb-8">
+            <div className="overflow-x-auto border border-gray-200 rounded-md">
+              <table className="min-w-full text-xs">
+                <thead className="bg-gray-50">
+                  <tr>
+                    {previewColumns.map(column => (
+                      <th key={column} className="px-3 py-2 text-left font-semibold text-gray-600">{column}</th>
+                    ))}
+                  </tr>
+                </thead>
+                <tbody>
+                  {previewRows.map((row, rowIndex) => (
+                    <tr key={rowIndex} className="border-t border-gray-100">
+                      {row.map((value, columnIndex) => (
+                        <td key={columnIndex} className="px-3 py-1 text-gray-800 whitespace-nowrap">{value ?? ''}</td>
+                      ))}
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            </div>
+            <div className="mt-2 flex items-center gap-3 text-xs text-gray-600">
+              <span>{previewRows.length} rows shown</span>
+              {previewCursor && (
+                <button
+                  className="text-blue-600 hover:underline disabled:opacity-50 cursor-pointer"
+                  onClick={() => handlePreview(true)}
+                  disabled={isPreviewing}
+                >
+                  Load more
+                </button>
+              )}
+            </div>
+          </div>
+        )}
       </main>
 
       {/* Export Popup Modal */}